@@ -0,0 +1,115 @@
+"""
+Tests for the tab-completer installed by initialize_readline.
+
+The readline module is replaced with a stub so the completer can be driven
+directly with a chosen line buffer.
+"""
+
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from utilities import readlineSetup
+
+
+def _volume():
+    """get set"""
+
+
+def _squelch():
+    """get set level"""
+
+
+def _plain():
+    pass
+
+
+@pytest.fixture
+def complete(monkeypatch):
+    """Install the completer for a small command table and return a driver."""
+    line = {"buffer": ""}
+    stub = SimpleNamespace(
+        get_line_buffer=lambda: line["buffer"],
+        set_completer=lambda fn: setattr(stub, "completer", fn),
+        parse_and_bind=lambda spec: None,
+        set_history_length=lambda n: None,
+    )
+    monkeypatch.setitem(sys.modules, "readline", stub)
+    readlineSetup.initialize_readline(
+        {
+            "volume": _volume,
+            "vfo": _plain,
+            "squelch": _squelch,
+            "help": _plain,
+        }
+    )
+
+    def run(buffer, text):
+        """Return every candidate readline would collect for text."""
+        line["buffer"] = buffer
+        matches = []
+        state = 0
+        while (match := stub.completer(text, state)) is not None:
+            matches.append(match)
+            state += 1
+        return matches
+
+    return run
+
+
+def test_matches_computed_once_per_input(complete, monkeypatch):
+    """Successive state calls for the same input reuse one match list."""
+    calls = []
+    real_bisect_left = readlineSetup.bisect.bisect_left
+    monkeypatch.setattr(
+        readlineSetup.bisect,
+        "bisect_left",
+        lambda *args: calls.append(args) or real_bisect_left(*args),
+    )
+
+    assert complete("v", "v") == ["vfo", "volume"]
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("", ["help", "squelch", "vfo", "volume"]),
+        ("v", ["vfo", "volume"]),
+        ("vo", ["volume"]),
+        ("volume", ["volume"]),
+        ("volumes", []),
+        ("x", []),
+    ],
+)
+def test_top_level_prefix_ranges(complete, text, expected):
+    """Bisect prefix lookup returns exactly the sorted commands with text."""
+    assert complete(text, text) == expected
+
+
+@pytest.mark.parametrize(
+    "buffer, text, expected",
+    [
+        ("volume s", "s", ["set"]),
+        ("VOLUME s", "s", ["set"]),
+        ("Squelch l", "l", ["level"]),
+        ("vfo g", "g", []),
+        ("unknown g", "g", []),
+    ],
+)
+def test_subcommands_looked_up_case_insensitively(
+    complete, buffer, text, expected
+):
+    """Subcommands come from the handler docstring whatever the case typed."""
+    assert complete(buffer, text) == expected
+
+
+def test_tools_module_shares_the_completer():
+    """utilities.tools.readline_setup re-exports the single implementation."""
+    from utilities.tools import readline_setup
+
+    assert (
+        readline_setup.initialize_readline
+        is readlineSetup.initialize_readline
+    )
@@ -0,0 +1,373 @@
+"""
+Tests for scanner detection and serial I/O in scanner_utils_uniden.
+
+Scanners are faked with pseudo-terminals: a responder thread on the master
+side answers MDL/WI like a real radio while the module under test talks to
+the slave device through pyserial.
+"""
+
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("serial")
+
+if sys.platform == "win32":
+    pytest.skip("pty fake scanners need POSIX", allow_module_level=True)
+
+import pty  # noqa: E402
+import tty  # noqa: E402
+
+import serial  # noqa: E402
+
+from utilities import scanner_utils_uniden as su  # noqa: E402
+
+UNIDEN = {b"MDL": b"MDL,BCD325P2\r"}
+AOR = {b"MDL": b"ERR\r", b"WI": b"AR-DV1\r"}
+
+
+@pytest.fixture(autouse=True)
+def _reset_state(monkeypatch, tmp_path):
+    """Isolate probe ordering and the port cache from other tests."""
+    monkeypatch.setattr(su, "_last_detected_type", None)
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+
+@pytest.fixture
+def fake_scanner():
+    """Return a factory creating pty-backed fake scanners."""
+    fds = []
+
+    def make(answers, description="USB Serial Port", ignore_first=0):
+        master, slave = pty.openpty()
+        tty.setraw(slave)
+        fds.extend([master, slave])
+        received = []
+
+        def respond():
+            buf = b""
+            while True:
+                try:
+                    data = os.read(master, 256)
+                except OSError:
+                    return
+                buf += data
+                while b"\r" in buf:
+                    cmd, buf = buf.split(b"\r", 1)
+                    received.append(cmd)
+                    if len(received) <= ignore_first:
+                        continue
+                    if cmd in answers:
+                        os.write(master, answers[cmd])
+
+        threading.Thread(target=respond, daemon=True).start()
+        return SimpleNamespace(
+            device=os.ttyname(slave),
+            description=description,
+            vid=None,
+            pid=None,
+            master=master,
+            received=received,
+        )
+
+    yield make
+    for fd in fds:
+        os.close(fd)
+
+
+@pytest.fixture
+def open_pty():
+    """Return (master_fd, serial) for a raw pty opened with pyserial."""
+    master, slave = pty.openpty()
+    tty.setraw(slave)
+    ser = serial.Serial(os.ttyname(slave), 115200, timeout=1.0)
+    yield master, ser
+    ser.close()
+    os.close(master)
+    os.close(slave)
+
+
+class NoFdSerial:
+    """Wrap a pyserial port as if it had no fileno(), like on Windows."""
+
+    def __init__(self, ser):
+        self._ser = ser
+        self.in_waiting_calls = 0
+        self.read_sizes = []
+
+    def fileno(self):
+        raise AttributeError("fileno")
+
+    @property
+    def in_waiting(self):
+        self.in_waiting_calls += 1
+        return self._ser.in_waiting
+
+    @property
+    def timeout(self):
+        return self._ser.timeout
+
+    @timeout.setter
+    def timeout(self, value):
+        self._ser.timeout = value
+
+    def read(self, size=1):
+        self.read_sizes.append(size)
+        return self._ser.read(size)
+
+
+def _use_ports(monkeypatch, ports):
+    """Make port enumeration return the given fake ports."""
+    monkeypatch.setattr(su, "_list_ports", lambda: list(ports))
+
+
+@pytest.mark.parametrize(
+    "probe", [su._probe_ports_select, su._probe_ports_threaded]
+)
+def test_probe_detects_uniden_and_aor(fake_scanner, probe):
+    """Both probe paths identify MDL and WI responders and skip silent ports."""
+    ports = [fake_scanner(UNIDEN), fake_scanner(AOR), fake_scanner({})]
+
+    detected = probe(ports, 115200, 0.3)
+
+    assert sorted(detected) == sorted(
+        [
+            (ports[0].device, "BCD325P2", "uniden"),
+            (ports[1].device, "AR-DV1", "aordv1"),
+        ]
+    )
+
+
+def test_probes_ordered_by_last_detected_type(fake_scanner, monkeypatch):
+    """The last detected type's probe goes first and stops on a match."""
+    aor = fake_scanner(AOR)
+    monkeypatch.setattr(su, "_last_detected_type", "aordv1")
+
+    result = su._probe_port(aor, 115200, 0.3)
+
+    assert result == (aor.device, "AR-DV1", "aordv1")
+    assert aor.received == [b"WI"]
+
+
+def test_probe_exception_does_not_skip_later_probes(monkeypatch):
+    """A failing MDL probe still lets the WI probe identify the radio."""
+
+    class FlakySerial:
+        """Serial stand-in whose MDL write fails and WI answers AR-DV1."""
+
+        def __init__(self, *args, **kwargs):
+            self.timeout = kwargs.get("timeout")
+            self.pending = b""
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def reset_input_buffer(self):
+            self.pending = b""
+
+        def write(self, data):
+            if data == b"MDL\r":
+                raise serial.SerialTimeoutException("write timeout")
+            self.pending = b"AR-DV1\r"
+
+        def fileno(self):
+            raise AttributeError("fileno")
+
+        @property
+        def in_waiting(self):
+            return len(self.pending)
+
+        def read(self, size=1):
+            data, self.pending = self.pending[:size], self.pending[size:]
+            return data
+
+    monkeypatch.setattr(serial, "Serial", FlakySerial)
+    port = SimpleNamespace(device="/dev/ttyFAKE", description="fake")
+
+    assert su._probe_port(port, 115200, 0.3) == (
+        "/dev/ttyFAKE",
+        "AR-DV1",
+        "aordv1",
+    )
+
+
+def test_read_response_keeps_bytes_after_cr(open_pty):
+    """Bytes after the first CR are returned by the next read."""
+    master, ser = open_pty
+    os.write(master, b"ONE\rTWO\r")
+    time.sleep(0.05)
+
+    assert su.read_response(ser) == "ONE"
+    assert su.read_response(ser, timeout=0.2) == "TWO"
+
+
+def test_read_response_bytes_returns_bytes(open_pty):
+    """The raw variant returns immutable bytes, stripped of the CR."""
+    master, ser = open_pty
+    os.write(master, b"VOL,5\r")
+
+    response = su.read_response_bytes(ser)
+
+    assert type(response) is bytes
+    assert response == b"VOL,5"
+
+
+def test_read_response_timeout_is_a_hard_limit(open_pty):
+    """A partial response arriving late does not extend the timeout."""
+    master, ser = open_pty
+    threading.Timer(0.3, os.write, args=(master, b"AB")).start()
+
+    start = time.monotonic()
+    response = su.read_response(ser, timeout=0.5)
+    elapsed = time.monotonic() - start
+
+    assert response == "AB"
+    assert elapsed < 0.7
+
+
+def test_read_response_without_fd_blocks_in_read(open_pty):
+    """Ports without an fd block in read() instead of polling in_waiting."""
+    master, ser = open_pty
+    port = NoFdSerial(ser)
+    threading.Timer(0.2, os.write, args=(master, b"SQL,3\r")).start()
+
+    assert su.read_response(port, timeout=1.0) == "SQL,3"
+    assert port.in_waiting_calls <= 2
+
+    start = time.monotonic()
+    assert su.read_response(port, timeout=0.3) == ""
+    assert time.monotonic() - start < 0.5
+    assert port.in_waiting_calls <= 2
+
+
+def test_low_latency_timeouts_read_response_in_one_call(
+    open_pty, monkeypatch
+):
+    """With low-latency COMMTIMEOUTS active, one large read is issued."""
+    master, ser = open_pty
+    port = NoFdSerial(ser)
+    applied = []
+    monkeypatch.setattr(
+        su, "set_low_latency_timeouts", lambda s: applied.append(s) or True
+    )
+    os.write(master, b"GLG,01550000\r")
+    time.sleep(0.05)
+
+    assert su.read_response(port, timeout=0.5) == "GLG,01550000"
+    assert port.read_sizes == [su._READ_CHUNK]
+    assert applied == [port]
+
+
+def test_wait_for_data_sees_bytes_kept_after_cr(open_pty):
+    """A response already read past the CR counts as available data."""
+    master, ser = open_pty
+    os.write(master, b"ONE\rTWO\r")
+    time.sleep(0.05)
+
+    assert su.read_response(ser) == "ONE"
+    assert ser.in_waiting == 0
+    assert su.wait_for_data(ser, max_wait=0)
+
+    su.clear_serial_buffer(ser)
+    assert not su.wait_for_data(ser, max_wait=0)
+
+
+def test_cache_round_trip(fake_scanner, monkeypatch, tmp_path):
+    """A full scan writes the cache and the next call is served from it."""
+    ports = [fake_scanner(UNIDEN), fake_scanner({})]
+    _use_ports(monkeypatch, ports)
+
+    first = su.find_scanner_port(timeout=0.3)
+
+    assert first == [(ports[0].device, "BCD325P2", "uniden")]
+    assert (tmp_path / ".scanner_controller" / "last_port.json").exists()
+
+    def no_full_scan(*args):
+        raise AssertionError("cached scanner should skip the full scan")
+
+    monkeypatch.setattr(su, "_probe_ports", no_full_scan)
+    assert su.find_scanner_port(timeout=0.3) == first
+
+
+def test_cache_rescans_when_new_port_appears(fake_scanner, monkeypatch):
+    """A newly attached scanner is found even though the cache still works."""
+    ports = [fake_scanner(UNIDEN)]
+    _use_ports(monkeypatch, ports)
+    su.find_scanner_port(timeout=0.3)
+
+    ports.append(fake_scanner(AOR))
+    detected = su.find_scanner_port(timeout=0.3)
+
+    assert sorted(detected) == sorted(
+        [
+            (ports[0].device, "BCD325P2", "uniden"),
+            (ports[1].device, "AR-DV1", "aordv1"),
+        ]
+    )
+
+
+def test_cache_probes_cached_type_first(fake_scanner, monkeypatch):
+    """A cached AOR is sent WI first whatever type was detected last."""
+    aor = fake_scanner(AOR)
+    _use_ports(monkeypatch, [aor])
+    su.find_scanner_port(timeout=0.3)
+    aor.received.clear()
+    monkeypatch.setattr(su, "_last_detected_type", "uniden")
+
+    detected = su.find_scanner_port(timeout=0.3)
+
+    assert detected == [(aor.device, "AR-DV1", "aordv1")]
+    assert aor.received == [b"WI"]
+
+
+def test_unfiltered_ports_probed_when_likely_ports_fail(
+    fake_scanner, monkeypatch
+):
+    """An AOR on a generic adapter is found next to a silent Uniden port."""
+    silent = fake_scanner({}, description="Uniden BC125AT")
+    aor = fake_scanner(AOR, description="FT232R USB UART")
+    _use_ports(monkeypatch, [silent, aor])
+
+    detected = su.find_scanner_port(timeout=0.3, use_cache=False)
+
+    assert detected == [(aor.device, "AR-DV1", "aordv1")]
+
+
+def test_retry_passes_reprobe_unchanged_ports(fake_scanner, monkeypatch):
+    """A scanner that ignores the first pass is found on a later one."""
+    booting = fake_scanner(UNIDEN, ignore_first=2)
+    _use_ports(monkeypatch, [booting])
+
+    detected = su.find_scanner_port(
+        timeout=0.2, max_retries=3, retry_delay=0.01, use_cache=False
+    )
+
+    assert detected == [(booting.device, "BCD325P2", "uniden")]
+    assert booting.received.count(b"MDL") == 2
+
+
+def test_retry_passes_stop_after_max_retries(monkeypatch):
+    """Every pass probes again and no sleep follows the last one."""
+    port = SimpleNamespace(device="/dev/ttyX", description="", vid=None)
+    _use_ports(monkeypatch, [port])
+    probed = []
+    sleeps = []
+    monkeypatch.setattr(
+        su, "_probe_ports", lambda ports, *args: probed.extend(ports) or []
+    )
+    monkeypatch.setattr(su.time, "sleep", sleeps.append)
+
+    detected = su.find_scanner_port(
+        max_retries=3, retry_delay=0.2, use_cache=False
+    )
+
+    assert detected == []
+    assert probed == [port, port, port]
+    assert sleeps == pytest.approx([0.2, 0.6])
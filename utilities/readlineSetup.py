@@ -8,6 +8,8 @@ Provides cross-platform readline support with tab-completion.
 - If neither is available, disables tab completion
 """
 
+import bisect
+
 
 def initialize_readline(COMMANDS):
     """
@@ -40,6 +42,17 @@ def initialize_readline(COMMANDS):
             )
             return
 
+    # Precompute everything the completer needs; readline calls it on every
+    # Tab press, once per candidate.
+    cmd_keys = sorted(COMMANDS)
+    # Keyed by lowercased command name, matching how the typed command is
+    # normalised (and how parse_command looks commands up).
+    subs = {
+        k.lower(): (v.__doc__.split() if v.__doc__ else ())
+        for k, v in COMMANDS.items()
+    }
+    last = {"key": None, "matches": []}
+
     def completer(text, state):
         """
         Set up tab-completion for available COMMANDS.
@@ -47,32 +60,14 @@ def initialize_readline(COMMANDS):
         Dynamically filters commands and subcommands based on input.
         """
         buffer = readline.get_line_buffer().strip()
-        parts = buffer.split()
 
-        # If no input or first word, suggest top-level commands
-        if len(parts) == 0 or (len(parts) == 1 and not buffer.endswith(" ")):
-            matches = [cmd for cmd in COMMANDS if cmd.startswith(text)]
-
-        # If input contains a space, suggest subcommands or arguments
-        elif len(parts) >= 1:
-            command = parts[0].lower()
-            if command in COMMANDS:
-                # Get subcommands or arguments for the matched command
-                subcommands = (
-                    COMMANDS[command].__doc__.split()
-                    if COMMANDS[command].__doc__
-                    else []
-                )
-                subcommands = (
-                    COMMANDS[command].__doc__.split()
-                    if COMMANDS[command].__doc__
-                    else []
-                )
-                matches = [sub for sub in subcommands if sub.startswith(text)]
-            else:
-                matches = []
-        else:
-            matches = []
+        # Readline asks for state 0, 1, 2, ... on the same input; only
+        # compute the match list once per (buffer, text) pair.
+        key = (buffer, text)
+        if state == 0 or last["key"] != key:
+            last["key"] = key
+            last["matches"] = _find_matches(buffer, text)
+        matches = last["matches"]
 
         # Return the match for the current state
         try:
@@ -80,6 +75,21 @@ def initialize_readline(COMMANDS):
         except IndexError:
             return None
 
+    def _find_matches(buffer, text):
+        """Return the completion candidates for text within buffer."""
+        parts = buffer.split()
+
+        # If no input or first word, suggest top-level commands
+        if len(parts) == 0 or (len(parts) == 1 and not buffer.endswith(" ")):
+            lo = bisect.bisect_left(cmd_keys, text)
+            hi = bisect.bisect_left(cmd_keys, text + "\uffff")
+            return cmd_keys[lo:hi]
+
+        # If input contains a space, suggest subcommands or arguments
+        command = parts[0].lower()
+        subcommands = subs.get(command, ())
+        return [sub for sub in subcommands if sub.startswith(text)]
+
     # Configure readline settings
     readline.set_completer(completer)
     readline.parse_and_bind(
@@ -18,7 +18,8 @@ Key Features:
   specified time frame.
 
 Dependencies:
-- `pyserial`: Used for serial communication and port scanning.
+- `pyserial`: Used for serial communication and port scanning. It is
+  imported lazily, so only port discovery pays its import cost.
 - `re`: Used for regular expression matching to identify scanner responses.
 - `logging`: Used for logging debug information to a file.
 
@@ -34,11 +35,18 @@ Scanner Utils Uniden module.
 This module provides functionality related to scanner utils uniden.
 """
 
+import functools
+import json
+import os
 import re
+import select
+import sys
+import threading
 import time
-
-import serial
-from serial.tools import list_ports
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from types import SimpleNamespace
 
 # Import centralized logging utilities
 from utilities.log_utils import get_logger
@@ -46,40 +54,534 @@ from utilities.log_utils import get_logger
 # Get a logger for this module
 logger = get_logger(__name__)
 
+# USB vendor IDs of known scanners (Uniden; add AOR as discovered)
+KNOWN_VIDS = {0x1965, 0x08C7}
+
+# Port descriptions worth probing when the vendor ID is not recognised
+SUSPECT_DESC_RE = re.compile(r"uniden|aor|usb.*serial", re.I)
+
+# Opt-in switch for low-latency Windows serial timeouts (see
+# set_low_latency_timeouts); off by default as some USB serial drivers
+# misbehave with non-default COMMTIMEOUTS.
+LOW_LATENCY_ENV = "SCANNER_LOW_LATENCY_SERIAL"
+
+# Response to "MDL" from a Uniden-style scanner
+_MDL_RE = re.compile(rb"^MDL,([A-Za-z0-9,]+)$")
+
+# Response to "WI" from an AOR AR-DV1
+_AR_DV1_RE = re.compile(rb"^(AR-DV1)$")
+
+# Identification probes as (command, response pattern, scanner type). The
+# patterns match raw response bytes; the first group is reported as the
+# model code.
+PROBES = [(b"MDL\r", _MDL_RE, "uniden"), (b"WI\r", _AR_DV1_RE, "aordv1")]
+
+# How long (seconds) the import-time port list stays usable
+_PORTS_MAX_AGE = 2.0
+
+# Where the last detected scanner port(s) are remembered between runs,
+# relative to the user's home directory
+_CACHE_RELPATH = Path(".scanner_controller") / "last_port.json"
+
+# Probe timeout used when re-checking a cached port
+_CACHE_TIMEOUT = 0.2
+
+# Ports whose low-latency COMMTIMEOUTS are in effect, mapped to the
+# ser.timeout they were applied for
+_low_latency_ports = weakref.WeakKeyDictionary()
+
+# Largest single read once low-latency COMMTIMEOUTS make ReadFile return
+# as soon as any byte is buffered
+_READ_CHUNK = 4096
+
+# Bytes read past the end of a response, per port, for the next read
+_leftover = weakref.WeakKeyDictionary()
+
+# Scanner type found by the most recent successful probe; its probe is
+# tried first next time.
+_last_detected_type = None
+
 
 def clear_serial_buffer(ser):
     """
     Clear accumulated data in the serial buffer.
 
-    This function clears the serial input and output buffers before sending
-    commands.
+    This function clears both the serial input and output buffers. Purging
+    the output buffer blocks on the driver, so use it for setup/teardown and
+    prefer clear_input_buffer() before individual commands.
     """
+    _leftover.pop(ser, None)
     ser.reset_input_buffer()
     ser.reset_output_buffer()
 
 
+def clear_input_buffer(ser):
+    """
+    Discard unread input so the next read sees only the new response.
+
+    Unlike clear_serial_buffer(), the output buffer is left alone, which
+    makes this cheap enough to call before every command. It also drops
+    bytes read_response() kept from past the previous carriage return.
+    """
+    _leftover.pop(ser, None)
+    ser.reset_input_buffer()
+
+
+def set_low_latency_timeouts(ser):
+    """
+    Make reads on a Windows serial port return as soon as any byte arrives.
+
+    pyserial's default COMMTIMEOUTS make ReadFile wait for the full request
+    or the total timeout. Setting ReadIntervalTimeout and the read multiplier
+    to MAXDWORD instead returns immediately once data is buffered, while
+    still waiting up to ser.timeout when nothing has arrived yet. The
+    blocking read in read_response_bytes() relies on this to fetch a whole
+    response with one ReadFile call.
+
+    Only applied on Windows and when the SCANNER_LOW_LATENCY_SERIAL
+    environment variable is set to "1". Return True if applied.
+    """
+    if sys.platform != "win32" or os.environ.get(LOW_LATENCY_ENV) != "1":
+        return False
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class COMMTIMEOUTS(ctypes.Structure):
+            _fields_ = [
+                ("ReadIntervalTimeout", wintypes.DWORD),
+                ("ReadTotalTimeoutMultiplier", wintypes.DWORD),
+                ("ReadTotalTimeoutConstant", wintypes.DWORD),
+                ("WriteTotalTimeoutMultiplier", wintypes.DWORD),
+                ("WriteTotalTimeoutConstant", wintypes.DWORD),
+            ]
+
+        maxdword = 0xFFFFFFFF
+        timeout_ms = int((ser.timeout or 0) * 1000)
+        timeouts = COMMTIMEOUTS(maxdword, maxdword, timeout_ms, 0, 0)
+        kernel32 = ctypes.windll.kernel32
+        if not kernel32.SetCommTimeouts(
+            ser._port_handle, ctypes.byref(timeouts)
+        ):
+            logger.warning("SetCommTimeouts failed; using pyserial defaults")
+            return False
+    except Exception as e:
+        logger.warning(f"Could not set low-latency timeouts: {e}")
+        return False
+    return True
+
+
+def _set_read_timeout(ser, timeout):
+    """
+    Set the blocking read timeout, keeping low-latency COMMTIMEOUTS applied.
+
+    pyserial rewrites the COMMTIMEOUTS whenever ser.timeout changes, so they
+    are re-applied after every change. Return True if a read on ser returns
+    as soon as any byte is buffered.
+    """
+    if ser.timeout != timeout:
+        ser.timeout = timeout
+        _low_latency_ports.pop(ser, None)
+    if _low_latency_ports.get(ser) != timeout:
+        if set_low_latency_timeouts(ser):
+            _low_latency_ports[ser] = timeout
+    return _low_latency_ports.get(ser) == timeout
+
+
+def read_response_bytes(ser, timeout=1.0):
+    """
+    Read bytes from the serial port until a carriage return.
+
+    Returns the raw response with surrounding whitespace stripped. Whatever
+    is already buffered is read in a single call rather than one byte at a
+    time. The call never blocks longer than timeout.
+
+    Bytes received after the carriage return are kept for the next read on
+    the same port. pyserial does not see them (ser.in_waiting excludes
+    them), so check for data with wait_for_data() and discard input with
+    clear_input_buffer() or clear_serial_buffer() from this module rather
+    than calling ser.reset_input_buffer() directly.
+    """
+    deadline = time.monotonic() + timeout
+    try:
+        fd = ser.fileno()
+    except Exception:
+        fd = None
+    buf = _leftover.pop(ser, None) or bytearray()
+    while b"\r" not in buf:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        if fd is None:
+            # No fd to select() on (pyserial on Windows): block in the driver
+            # for up to the remaining time. With low-latency COMMTIMEOUTS a
+            # single large read returns whatever has arrived; otherwise
+            # wait for one byte and take the rest in bulk.
+            if _set_read_timeout(ser, remaining):
+                chunk = ser.read(_READ_CHUNK)
+            else:
+                chunk = ser.read(1)
+                n = ser.in_waiting if chunk else 0
+                if n:
+                    chunk += ser.read(n)
+            if not chunk:
+                break
+            buf.extend(chunk)
+            continue
+        if not wait_for_data(ser, remaining, fd=fd):
+            break
+        n = ser.in_waiting
+        if not n:
+            # Readable but nothing to read: the port was hung up.
+            break
+        buf.extend(ser.read(n))
+    line, _, rest = buf.partition(b"\r")
+    if rest:
+        _leftover[ser] = rest
+    return bytes(line.strip())
+
+
 def read_response(ser, timeout=1.0):
     """
     Read bytes from the serial port until a carriage return.
 
-    Reads a response from the serial port with a timeout.
+    Reads a response from the serial port with a timeout and decodes it.
     """
-    ser.timeout = timeout
-    response = ser.read_until(b"\r").decode("utf-8").strip()
-    return response
+    return read_response_bytes(ser, timeout).decode("utf-8", "replace")
+
+
+@functools.lru_cache(maxsize=256)
+def _encode_cmd(cmd):
+    """Return the CR-terminated wire bytes for cmd, cached per command."""
+    return f"{cmd}\r".encode("utf-8")
 
 
 def send_command(ser, cmd):
     """
-    Clear the buffer and send a command (with CR termination) to a scanner.
+    Send a command (with CR termination) to a scanner.
 
     This function sends a command to the serial port and returns the response.
+    Neither buffer is flushed first; call clear_input_buffer() beforehand if
+    stale input may be pending.
     """
-    ser.write(f"{cmd}\r".encode("utf-8"))
+    ser.write(_encode_cmd(cmd))
     return read_response(ser)
 
 
-def find_scanner_port(baudrate=115200, timeout=0.5, max_retries=2):
+def send_command_bytes(ser, cmd):
+    """
+    Send a command to a scanner and return the raw response bytes.
+
+    Same as send_command() but skips decoding, for polling loops that only
+    match the response against a bytes pattern.
+    """
+    ser.write(_encode_cmd(cmd))
+    return read_response_bytes(ser)
+
+
+def _ordered_probes(preferred=None):
+    """
+    Return PROBES with the preferred scanner type's probe first.
+
+    preferred defaults to the last detected scanner type.
+    """
+    if preferred is None:
+        preferred = _last_detected_type
+    return sorted(PROBES, key=lambda probe: probe[2] != preferred)
+
+
+def _probe_port(port, baudrate, timeout, preferred=None):
+    """
+    Probe a single COM port for a supported scanner.
+
+    Return a (device, model_code, scanner_type) tuple if a scanner answers,
+    otherwise None. Each probe is isolated so a failure in one does not stop
+    the others from being tried. The probe for the preferred scanner type
+    (by default the last one detected) is sent first.
+    """
+    global _last_detected_type
+    import serial
+
+    try:
+        with serial.Serial(port.device, baudrate, timeout=timeout) as ser:
+            logger.info(f"Trying port: {port.device}")
+            logger.info(f"Port description: {port.description}")
+            for command, pattern, scanner_type in _ordered_probes(preferred):
+                try:
+                    clear_input_buffer(ser)
+                    ser.write(command)
+                    response = read_response_bytes(ser, timeout)
+                except Exception as e:
+                    logger.warning(
+                        f"{scanner_type} probe failed on {port.device}: {e}"
+                    )
+                    continue
+                logger.info(f"Response from {port.device}: {response!r}")
+                m = pattern.match(response)
+                if m:
+                    _last_detected_type = scanner_type
+                    model_code = m.group(1).decode("ascii")
+                    return (port.device, model_code, scanner_type)
+    except Exception as e:
+        logger.warning(f"Error checking port {port.device}: {e}")
+    return None
+
+
+def _enumerate_in_background(future):
+    """Fill future with the current COM port list."""
+    try:
+        from serial.tools import list_ports
+
+        future.set_result(list(list_ports.comports()))
+    except Exception as e:
+        future.set_exception(e)
+
+
+# Port enumeration can take hundreds of milliseconds on Windows, so start it
+# at import time; the first find_scanner_port() call picks up the result.
+_ports_future = Future()
+_ports_started = time.monotonic()
+threading.Thread(
+    target=_enumerate_in_background, args=(_ports_future,), daemon=True
+).start()
+
+
+def _list_ports():
+    """
+    Return the current COM ports.
+
+    The first call reuses the import-time background enumeration while it is
+    still fresh; every other call enumerates again.
+    """
+    global _ports_future
+    future, _ports_future = _ports_future, None
+    if (
+        future is not None
+        and time.monotonic() - _ports_started < _PORTS_MAX_AGE
+    ):
+        try:
+            return future.result(timeout=1.0)
+        except Exception as e:
+            logger.debug(f"Background port enumeration unavailable: {e}")
+    from serial.tools import list_ports
+
+    return list_ports.comports()
+
+
+def _candidate_ports():
+    """
+    Split the COM ports into likely scanner ports and the rest.
+
+    Ports are matched on USB vendor ID or description so the likely ones can
+    be probed first, without opening mice, modems or Bluetooth virtual
+    ports. The rest are still returned because AOR radios and many generic
+    USB serial adapters match neither.
+
+    Returns:
+        (likely, others): Two lists of ListPortInfo objects.
+    """
+    likely, others = [], []
+    for p in _list_ports():
+        if p.vid in KNOWN_VIDS or (
+            p.description and SUSPECT_DESC_RE.search(p.description)
+        ):
+            likely.append(p)
+        else:
+            others.append(p)
+    return likely, others
+
+
+def _probe_ports(ports, baudrate, timeout):
+    """Probe ports concurrently with the best method for this platform."""
+    if not ports:
+        return []
+    if os.name == "posix":
+        return _probe_ports_select(ports, baudrate, timeout)
+    return _probe_ports_threaded(ports, baudrate, timeout)
+
+
+def _probe_ports_threaded(ports, baudrate, timeout):
+    """Probe ports in parallel with one worker thread per port."""
+    with ThreadPoolExecutor(max_workers=min(16, len(ports))) as ex:
+        futures = [
+            ex.submit(_probe_port, p, baudrate, timeout) for p in ports
+        ]
+        return [r for f in as_completed(futures) if (r := f.result())]
+
+
+def _probe_ports_select(ports, baudrate, timeout):
+    """
+    Probe ports concurrently from a single thread using select().
+
+    Every port is opened non-blocking and sent the same probe; the replies
+    are then collected with select() until each port has answered or the
+    timeout expires. Ports that did not match move on to the next probe.
+    Requires ports with a real file descriptor, i.e. POSIX.
+    """
+    global _last_detected_type
+    import serial
+
+    opened = {}
+    for port in ports:
+        try:
+            ser = serial.Serial(port.device, baudrate, timeout=0)
+        except Exception as e:
+            logger.warning(f"Error checking port {port.device}: {e}")
+            continue
+        logger.info(f"Trying port: {port.device}")
+        logger.info(f"Port description: {port.description}")
+        opened[ser.fileno()] = (port, ser)
+
+    detected = []
+    pending = dict(opened)
+    try:
+        for command, pattern, scanner_type in _ordered_probes():
+            bufs = {}
+            for fd, (port, ser) in list(pending.items()):
+                try:
+                    clear_input_buffer(ser)
+                    ser.write(command)
+                except Exception as e:
+                    logger.warning(
+                        f"{scanner_type} probe failed on {port.device}: {e}"
+                    )
+                    continue
+                bufs[fd] = bytearray()
+
+            deadline = time.monotonic() + timeout
+            while bufs:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                readable, _, _ = select.select(list(bufs), [], [], remaining)
+                for fd in readable:
+                    port, ser = pending[fd]
+                    try:
+                        bufs[fd].extend(ser.read(ser.in_waiting or 1))
+                    except Exception as e:
+                        logger.warning(f"Error reading {port.device}: {e}")
+                        del bufs[fd]
+                        continue
+                    if b"\r" not in bufs[fd]:
+                        continue
+                    line = bufs.pop(fd).split(b"\r", 1)[0]
+                    response = bytes(line.strip())
+                    logger.info(f"Response from {port.device}: {response!r}")
+                    m = pattern.match(response)
+                    if m:
+                        _last_detected_type = scanner_type
+                        model_code = m.group(1).decode("ascii")
+                        detected.append((port.device, model_code, scanner_type))
+                        del pending[fd]
+            if not pending:
+                break
+    finally:
+        for _, ser in opened.values():
+            ser.close()
+    return detected
+
+
+def _cache_path():
+    """Return the port cache path, or None if there is no home directory."""
+    try:
+        return Path.home() / _CACHE_RELPATH
+    except RuntimeError:
+        return None
+
+
+def _load_cached_ports():
+    """
+    Return the cached scanner entries and the ports seen at scan time.
+
+    Returns:
+        (entries, seen): A list of scanner entry dicts and a set of device
+        names. Both are empty if the cache is missing or unreadable.
+    """
+    path = _cache_path()
+    if path is None:
+        return [], set()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return [], set()
+    if not isinstance(cache, dict):
+        return [], set()
+    entries = [
+        e
+        for e in cache.get("scanners", [])
+        if isinstance(e, dict) and e.get("device")
+    ]
+    return entries, set(cache.get("ports", []))
+
+
+def _save_cached_ports(detected, ports):
+    """Remember the detected scanners and the ports seen for next time."""
+    by_device = {p.device: p for p in ports}
+    entries = []
+    for device, model_code, scanner_type in detected:
+        port = by_device.get(device)
+        entries.append(
+            {
+                "device": device,
+                "model_code": model_code,
+                "type": scanner_type,
+                "vid": getattr(port, "vid", None),
+                "pid": getattr(port, "pid", None),
+            }
+        )
+    path = _cache_path()
+    if path is None:
+        logger.debug("No home directory; not caching scanner ports")
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"scanners": entries, "ports": sorted(by_device)}, f, indent=2
+            )
+    except OSError as e:
+        logger.debug(f"Could not write scanner port cache: {e}")
+
+
+def _probe_cached_ports(baudrate, ports):
+    """
+    Re-probe the scanners remembered from the last successful scan.
+
+    ports is the current port list. Return the cached scanners' detection
+    tuples if every one still answers as the same type and no port has
+    appeared since the cache was written (e.g. a newly attached second
+    scanner). Otherwise return None so the caller does a full scan.
+    """
+    entries, seen = _load_cached_ports()
+    if not entries:
+        return None
+    new_ports = [p.device for p in ports if p.device not in seen]
+    if new_ports:
+        logger.info(f"New ports since last scan: {new_ports}; full scan")
+        return None
+    detected = []
+    for entry in entries:
+        port = SimpleNamespace(
+            device=entry["device"], description="cached scanner port"
+        )
+        result = _probe_port(
+            port, baudrate, _CACHE_TIMEOUT, preferred=entry.get("type")
+        )
+        if not result or result[2] != entry.get("type"):
+            logger.info(f"Cached scanner port {entry['device']} is stale")
+            return None
+        detected.append(result)
+    return detected
+
+
+def find_scanner_port(
+    baudrate=115200,
+    timeout=0.5,
+    max_retries=1,
+    retry_delay=0.5,
+    use_cache=True,
+):
     """
     Scan all COM ports and return a list of tuples.
 
@@ -87,58 +589,87 @@ def find_scanner_port(baudrate=115200, timeout=0.5, max_retries=2):
     as a Uniden-style scanner.
     - If the scanner responds to "WI" with "AR-DV1", it is treated as an AOR-DV1
     scanner.
+
+    Ports are probed concurrently (a select() loop on POSIX, a thread pool
+    elsewhere), so a pass takes roughly as long as the slowest single probe
+    rather than the sum of all of them.
+
+    The ports found are remembered in ~/.scanner_controller/last_port.json
+    and, when use_cache is True, re-checked first on the next call so an
+    unchanged setup is found without scanning every port. A full scan is
+    still done whenever a port has appeared since the cache was written.
+
+    max_retries is the number of scan passes; one is usually enough. Callers
+    that expect a scanner to still be enumerating (e.g. just plugged in) can
+    pass more, waiting retry_delay seconds after the first pass and three
+    times longer after each following one (capped at 3 seconds).
     """
     detected = []
     retries = 0
-    mdl_pattern = re.compile(r"^MDL,([A-Za-z0-9,]+)$")
     while retries < max_retries:
-        ports = list_ports.comports()
-        for port in ports:
-            try:
-                with serial.Serial(
-                    port.device, baudrate, timeout=timeout
-                ) as ser:
-                    # Check for Uniden-style scanners
-                    logger.info(f"Trying port: {port.device}")
-                    logger.info(f"Port description: {port.description}")
-                    ser.write(b"MDL\r")
-                    response = read_response(ser)
-                    logger.info(f"Response from {port.device}: {response}")
-                    if mdl_pattern.match(response):
-                        model_code = mdl_pattern.match(response).group(1)
-                        detected.append((port.device, model_code, "uniden"))
-                        continue
-
-                    # Check for AOR-DV1 scanners
-                    ser.write(b"WI\r")
-                    response = read_response(ser)
-                    logger.info(f"Response from {port.device}: {response}")
-                    if response.strip() == "AR-DV1":
-                        detected.append((port.device, "AR-DV1", "aordv1"))
-            except Exception as e:
-                logger.warning(f"Error checking port {port.device}: {e}")
-                continue
+        # Every pass re-probes all ports: a port that was busy or a scanner
+        # that was still booting on the previous pass may answer now.
+        likely, others = _candidate_ports()
+        ports = likely + others
+        if use_cache and retries == 0:
+            detected = _probe_cached_ports(baudrate, ports)
+            if detected:
+                logger.info("Using cached scanner port(s)")
+                return detected
+        detected = _probe_ports(likely, baudrate, timeout)
+        if not detected and others:
+            # AOR radios and generic USB serial adapters don't match the
+            # filter, so fall back to every remaining port.
+            logger.debug("No scanner on likely ports; probing the rest")
+            detected = _probe_ports(others, baudrate, timeout)
 
         if detected:
+            _save_cached_ports(detected, ports)
             return detected
 
         retries += 1
-        logger.info("No scanners found. Retrying in 3 seconds...")
-        time.sleep(3)
+        if retries >= max_retries:
+            break
+        delay = min(3.0, retry_delay * 3 ** (retries - 1))
+        logger.info(f"No scanners found. Retrying in {delay:.1f} seconds...")
+        time.sleep(delay)
 
     logger.error("No scanners found after maximum retries.")
     return detected
 
 
-def wait_for_data(ser, max_wait=0.3):
+def wait_for_data(ser, max_wait=0.3, fd=None):
     """
     Wait up to max_wait seconds for incoming data on the serial port.
 
-    Return True if data is available, otherwise False.
+    Return True if data is available, otherwise False. This includes bytes
+    already read past the end of a previous response by read_response().
+    On POSIX the wait is a blocking select() on the port's file descriptor;
+    ports without a usable fileno() (e.g. pyserial on Windows) fall back to
+    polling.
+
+    High-rate polling loops can resolve ser.fileno() once and pass it as fd
+    to skip the lookup on every call.
     """
-    start = time.time()
-    while time.time() - start < max_wait:
+    if _leftover.get(ser):
+        return True
+    if fd is None:
+        try:
+            fd = ser.fileno()
+        except Exception:
+            return _poll_for_data(ser, max_wait)
+    try:
+        readable, _, _ = select.select([fd], [], [], max_wait)
+    except (OSError, ValueError):
+        return _poll_for_data(ser, max_wait)
+    return bool(readable)
+
+
+def _poll_for_data(ser, max_wait):
+    """Poll in_waiting until data arrives or max_wait seconds elapse."""
+    deadline = time.monotonic() + max_wait
+    while time.monotonic() < deadline:
         if ser.in_waiting:
             return True
-        time.sleep(0.01)
+        time.sleep(0.001)
     return False